@@ -15,6 +15,10 @@ from .core import (
     styled_boxplot,
 )
 from .geo import styled_choropleth
+from .pool import FigurePool
+from .report import Report
+from .trend import fit_trend
+from .aio import AsyncRenderer, arender
 # Import du style
 from .styles import apply_style, get_color, get_categorical_colors
 
@@ -33,4 +37,9 @@ __all__ = [
     'get_color',
     'get_categorical_colors',
     'styled_choropleth',
+    'FigurePool',
+    'Report',
+    'fit_trend',
+    'AsyncRenderer',
+    'arender',
 ]
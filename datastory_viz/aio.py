@@ -0,0 +1,181 @@
+"""
+Rendu asynchrone des fonctions styled_* pour les serveurs web (asyncio)
+Le rendu matplotlib est CPU-bound : il est délégué à un pool de processus
+pré-chauffés pour ne jamais bloquer la boucle d'événements.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .core import styled_bar
+from .report import _default_context, _init_worker, _render_chart
+
+
+def _init_async_worker():
+    """
+    Initialise un processus worker (backend Agg) puis effectue un premier
+    rendu pour charger polices et caches.
+    """
+    _init_worker()
+    _render_chart(styled_bar, (['A'], [1]), {}, 'png', 10)
+
+
+def _ping():
+    return os.getpid()
+
+
+async def _acquire(slots, timeout):
+    """
+    Prend une place dans la file, avec une attente maximale optionnelle
+
+    Contrairement à asyncio.wait_for (Python <= 3.11), l'annulation de
+    l'appelant n'est jamais ignorée, même si la place est obtenue au même
+    moment : elle est alors rendue et CancelledError est propagée.
+    """
+    if timeout is None:
+        await slots.acquire()
+        return
+    if hasattr(asyncio, 'timeout'):  # Python >= 3.11
+        async with asyncio.timeout(timeout):
+            await slots.acquire()
+        return
+
+    acquire = asyncio.ensure_future(slots.acquire())
+    try:
+        done, _ = await asyncio.wait({acquire}, timeout=timeout)
+    except asyncio.CancelledError:
+        if acquire.done() and not acquire.cancelled():
+            slots.release()
+        else:
+            acquire.cancel()
+        raise
+    if not done:
+        # Semaphore.acquire rend d'elle-même une place obtenue puis annulée
+        acquire.cancel()
+        raise asyncio.TimeoutError()
+
+
+class AsyncRenderer:
+    """
+    Pool de rendu borné, utilisable depuis des coroutines
+
+    Exemple (FastAPI) :
+        renderer = AsyncRenderer(max_workers=4)
+
+        @app.get("/chart.png")
+        async def chart():
+            png = await renderer.render(styled_bar, categories, values)
+            return Response(png, media_type="image/png")
+
+    Args:
+        max_workers: Nombre de processus de rendu (défaut: nombre de CPU)
+        max_pending: Nombre maximal de rendus en cours ou en file
+            (défaut: 4 * max_workers) ; au-delà, les appelants attendent
+        queue_timeout: Attente maximale (s) d'une place dans la file avant
+            asyncio.TimeoutError (défaut: attente illimitée)
+        prewarm: Démarrer et initialiser les workers dès la création
+        mp_context: Contexte multiprocessing (ex. 'spawn' ou 'forkserver' ;
+            défaut: 'forkserver' si disponible, sinon 'spawn')
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, queue_timeout=None,
+                 prewarm=True, mp_context=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.max_workers
+        self.queue_timeout = queue_timeout
+        if mp_context is None:
+            mp_context = _default_context()
+        elif isinstance(mp_context, str):
+            mp_context = multiprocessing.get_context(mp_context)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=mp_context,
+                                             initializer=_init_async_worker)
+        self._slots = None
+        self._pending = 0
+        if prewarm:
+            for _ in range(self.max_workers):
+                self._executor.submit(_ping)
+
+    @property
+    def pending(self):
+        """Nombre de rendus en cours ou en file"""
+        return self._pending
+
+    async def render(self, func, *args, format='png', dpi=None, **kwargs):
+        """
+        Rend func(*args, **kwargs) dans un worker et renvoie les bytes
+
+        L'annulation de la coroutine annule le rendu s'il n'a pas commencé ;
+        la place dans la file n'est libérée qu'à la fin effective du rendu.
+
+        Args:
+            func: Fonction styled_* de niveau module
+            *args, **kwargs: Arguments transmis à func (picklables)
+            format: Format de sortie ('png', 'svg', 'pdf'...)
+            dpi: Résolution (défaut: rcParams['savefig.dpi'])
+
+        Returns:
+            bytes: Image encodée
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        slots = self._slots
+
+        await _acquire(slots, self.queue_timeout)
+
+        self._pending += 1
+        try:
+            future = self._executor.submit(_render_chart, func, args, kwargs,
+                                           format, dpi)
+        except BaseException:
+            self._release(slots)
+            raise
+        future.add_done_callback(
+            lambda _: self._call_soon(loop, self._release, slots))
+
+        data, _ = await asyncio.wrap_future(future)
+        return data
+
+    def _release(self, slots):
+        self._pending -= 1
+        slots.release()
+
+    @staticmethod
+    def _call_soon(loop, callback, *args):
+        # Appelé depuis le thread de l'executor : la boucle peut être fermée
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass
+
+    def close(self, wait=True):
+        """Arrête les processus workers"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+_default_renderer = None
+
+
+async def arender(func, *args, format='png', dpi=None, **kwargs):
+    """
+    Version asynchrone d'un appel styled_* : renvoie l'image en bytes
+
+    Utilise un AsyncRenderer partagé, créé au premier appel.
+
+    Exemple :
+        png = await arender(styled_bar, categories, values, format='png')
+    """
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = AsyncRenderer()
+    return await _default_renderer.render(func, *args, format=format, dpi=dpi,
+                                          **kwargs)
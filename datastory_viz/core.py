@@ -7,11 +7,21 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import pandas as pd
+from matplotlib.collections import PolyCollection
+from matplotlib.font_manager import FontProperties
 from .styles import apply_style, get_color, get_categorical_colors
+from .pool import new_figure
+from .trend import fit_trend
 
 # Appliquer le style au chargement du module
 apply_style()
 
+# Légendes des tendances non linéaires
+TREND_LABELS = {
+    'lowess': 'Tendance (LOWESS)',
+    'binned': 'Tendance (médiane par classe)',
+}
+
 
 def styled_line(x, y, title="", xlabel="", ylabel="", highlight_point=None, 
                 color=None, figsize=(10, 6), show_grid=True):
@@ -37,7 +47,7 @@ def styled_line(x, y, title="", xlabel="", ylabel="", highlight_point=None,
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
     
     # Couleur par défaut
     line_color = color if color else get_color('primary')
@@ -72,9 +82,111 @@ def styled_line(x, y, title="", xlabel="", ylabel="", highlight_point=None,
     return fig, ax
 
 
+def _max_label_length(labels):
+    """Longueur du plus long label (vectorisé, accepte tout type de catégorie)"""
+    if len(labels) == 0:
+        return 0
+    return int(np.char.str_len(np.asarray(labels).astype(str)).max())
+
+
+def _top_n_bars(categories, values, top_n, highlight_index, other_label):
+    """
+    Garde les top_n catégories par valeur (triées) et regroupe le reste
+
+    Returns:
+        labels, values, highlight: Labels (str), valeurs des barres et
+        position de la barre en highlight après réordonnancement (ou None)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if not np.isfinite(values).all():
+        # Une valeur manquante ne peut être ni classée ni sommée dans "Autres"
+        raise ValueError("top_n nécessite des valeurs finies (pas de NaN ni d'infini)")
+    if top_n < n:
+        # Sélection en O(n), seul le top est trié
+        top = np.argpartition(-values, top_n - 1)[:top_n]
+    else:
+        top = np.arange(n)
+    order = top[np.argsort(-values[top], kind='stable')]
+
+    labels = np.asarray(categories)[order].astype(str)
+    bar_values = values[order]
+    collapsed = len(order) < n
+    if collapsed:
+        rest = np.ones(n, dtype=bool)
+        rest[order] = False
+        labels = np.append(labels, other_label)
+        bar_values = np.append(bar_values, values[rest].sum())
+
+    highlight = None
+    if highlight_index is not None:
+        # Même règle que l'indexation d'une liste : seuls -n..n-1 sont valides
+        if not -n <= highlight_index < n:
+            raise IndexError(f"highlight_index {highlight_index} hors limites "
+                             f"pour {n} catégories")
+        position = np.flatnonzero(order == highlight_index % n)
+        if len(position):
+            highlight = int(position[0])
+        elif collapsed:
+            # La catégorie en highlight est regroupée : on met en évidence "Autres"
+            highlight = len(order)
+    return labels, bar_values, highlight
+
+
+def _draw_bar_collection(ax, values, colors, orientation, width=0.8):
+    """Trace toutes les barres en une seule PolyCollection"""
+    positions = np.arange(len(values), dtype=float)
+    low, high = positions - width / 2, positions + width / 2
+    zeros = np.zeros_like(values)
+    verts = np.stack([np.column_stack(pair) for pair in
+                      ((low, zeros), (low, values), (high, values), (high, zeros))],
+                     axis=1)
+    if orientation != 'vertical':
+        verts = verts[:, :, ::-1]
+    bars = PolyCollection(verts, facecolors=colors, edgecolors='none')
+    ax.add_collection(bars)
+    ax.autoscale_view()
+    return bars
+
+
+def _thin_tick_labels(fig, ax, labels, orientation):
+    """
+    Place un label sur k pour que les labels tiennent dans l'axe
+
+    Le nombre de labels affichables est estimé à partir de la taille de
+    l'axe en pixels et de la taille de police, sans mise en page du texte.
+    """
+    axis = ax.xaxis if orientation == 'vertical' else ax.yaxis
+    labelsize = plt.rcParams['xtick.labelsize' if orientation == 'vertical'
+                             else 'ytick.labelsize']
+    font_px = FontProperties(size=labelsize).get_size_in_points() * fig.dpi / 72
+    box = ax.get_position()
+    width_in, height_in = fig.get_size_inches()
+    if orientation == 'vertical':
+        available_px = box.width * width_in * fig.dpi
+        label_px = 0.6 * font_px * (_max_label_length(labels) + 1)
+        # Labels longs ou trop nombreux : rotation, l'encombrement devient
+        # lié à la hauteur de ligne
+        rotate = _max_label_length(labels) > 8 or label_px * len(labels) > available_px
+        if rotate:
+            label_px = 1.5 * font_px
+    else:
+        available_px = box.height * height_in * fig.dpi
+        rotate = False
+        label_px = 1.5 * font_px
+
+    max_labels = max(1, int(available_px // label_px))
+    step = max(1, int(np.ceil(len(labels) / max_labels)))
+    positions = np.arange(0, len(labels), step)
+    axis.set_ticks(positions)
+    axis.set_ticklabels(labels[positions])
+    if rotate:
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+
 def styled_bar(categories, values, title="", xlabel="", ylabel="", 
                orientation='vertical', highlight_index=None, 
-               color=None, figsize=(10, 6)):
+               color=None, figsize=(10, 6), top_n=None, other_label="Autres"):
     """
     Graphique à barres pour comparaison entre catégories
     
@@ -90,14 +202,25 @@ def styled_bar(categories, values, title="", xlabel="", ylabel="",
         xlabel: Label de l'axe x
         ylabel: Label de l'axe y
         orientation: 'vertical' ou 'horizontal'
-        highlight_index: Index de la barre à mettre en évidence
+        highlight_index: Index (dans categories) de la barre à mettre en évidence
         color: Couleur personnalisée
         figsize: Taille de la figure
+        top_n: Mode grand nombre de catégories : garde les top_n valeurs
+            triées, regroupe le reste dans une barre other_label et
+            n'affiche que les labels qui tiennent dans l'axe ; les valeurs
+            doivent être finies (NaN ou infini : ValueError)
+        other_label: Label de la barre regroupant les autres catégories
     
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
+    
+    if top_n is not None:
+        if top_n < 1:
+            raise ValueError("top_n doit être supérieur ou égal à 1")
+        categories, values, highlight_index = _top_n_bars(
+            categories, values, top_n, highlight_index, other_label)
     
     # Couleurs : toutes neutres sauf la barre en highlight
     colors = [get_color('neutral')] * len(categories)
@@ -108,15 +231,25 @@ def styled_bar(categories, values, title="", xlabel="", ylabel="",
     else:
         colors = [get_color('primary')] * len(categories)
     
+    # Mode top_n : une seule collection et des labels éclaircis
+    if top_n is not None:
+        bars = _draw_bar_collection(ax, values, colors, orientation)
+        if orientation != 'vertical':
+            ax.invert_yaxis()  # Plus grande valeur en haut
+        _thin_tick_labels(fig, ax, categories, orientation)
+        if xlabel:
+            ax.set_xlabel(xlabel, fontweight='500')
+        if ylabel:
+            ax.set_ylabel(ylabel, fontweight='500')
     # Graphique vertical ou horizontal
-    if orientation == 'vertical':
+    elif orientation == 'vertical':
         bars = ax.bar(categories, values, color=colors, edgecolor='none')
         if ylabel:
             ax.set_ylabel(ylabel, fontweight='500')
         if xlabel:
             ax.set_xlabel(xlabel, fontweight='500')
         # Rotation des labels si nécessaire
-        if len(max(categories, key=len)) > 8:
+        if _max_label_length(categories) > 8:
             plt.xticks(rotation=45, ha='right')
     else:  # horizontal
         bars = ax.barh(categories, values, color=colors, edgecolor='none')
@@ -148,7 +281,8 @@ def styled_bar(categories, values, title="", xlabel="", ylabel="",
 
 def styled_scatter(x, y, title="", xlabel="", ylabel="", 
                    color=None, size=None, highlight_points=None,
-                   show_trend=False, figsize=(10, 6)):
+                   show_trend=False, figsize=(10, 6), trend='ols',
+                   trend_ci=None):
     """
     Nuage de points pour montrer les corrélations
     
@@ -166,13 +300,16 @@ def styled_scatter(x, y, title="", xlabel="", ylabel="",
         color: Couleur(s) des points (peut être une liste pour groupes)
         size: Taille(s) des points (peut être une liste)
         highlight_points: Liste d'indices à mettre en évidence
-        show_trend: Afficher la ligne de tendance linéaire
+        show_trend: Afficher la ligne de tendance
         figsize: Taille de la figure
+        trend: Méthode de tendance : 'ols' (linéaire), 'lowess' ou
+            'binned' (médiane par classe de x), voir fit_trend
+        trend_ci: Niveau de la bande de confiance (ex. 0.95), None pour aucune
     
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
     
     # Couleur par défaut
     if color is None:
@@ -196,11 +333,17 @@ def styled_scatter(x, y, title="", xlabel="", ylabel="",
     
     # Ligne de tendance (à utiliser avec précaution selon le cours)
     if show_trend:
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
-        ax.plot(x, p(x), color=get_color('alert'), 
-               linestyle='--', linewidth=2, alpha=0.7,
-               label=f'Tendance: y={z[0]:.2f}x+{z[1]:.2f}')
+        fit = fit_trend(x, y, method=trend, ci=trend_ci)
+        if trend == 'ols':
+            label = f"Tendance: y={fit['coef'][0]:.2f}x+{fit['coef'][1]:.2f}"
+        else:
+            label = TREND_LABELS[trend]
+        ax.plot(fit['x'], fit['y'], color=get_color('alert'), 
+               linestyle='--', linewidth=2, alpha=0.7, label=label)
+        if trend_ci is not None:
+            ax.fill_between(fit['x'], fit['lower'], fit['upper'],
+                            color=get_color('alert'), alpha=0.1,
+                            linewidth=0)
         ax.legend()
     
     # Titres et labels
@@ -245,7 +388,7 @@ def styled_heatmap(data, title="", xlabel="", ylabel="",
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
     
     # Créer la heatmap
     sns.heatmap(data, annot=annot, fmt=fmt, cmap=cmap,
@@ -292,7 +435,7 @@ def styled_histogram(data, bins=30, title="", xlabel="", ylabel="Fréquence",
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
     
     # Couleur par défaut
     hist_color = color if color else get_color('primary')
@@ -355,7 +498,7 @@ def styled_boxplot(data, labels=None, title="", xlabel="", ylabel="",
     Returns:
         fig, ax: Figure et axes matplotlib
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = new_figure(figsize)
     
     # Couleur par défaut
     box_color = color if color else get_color('primary')
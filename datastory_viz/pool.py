@@ -0,0 +1,145 @@
+"""
+Gestion du cycle de vie des figures matplotlib
+Les fonctions styled_* créent normalement une nouvelle figure à chaque appel.
+Dans un processus longue durée, un FigurePool réutilise des figures vidées
+(même figsize) et les libère automatiquement après export.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+
+_SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+# Pool actif pour le thread courant (None : comportement par défaut)
+_local = threading.local()
+
+
+def new_figure(figsize):
+    """
+    Crée (ou emprunte au pool actif) une figure avec un seul axe
+
+    Utilisée par toutes les fonctions styled_* à la place de plt.subplots.
+    """
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        return plt.subplots(figsize=figsize)
+    return pool.acquire(figsize)
+
+
+class FigurePool:
+    """
+    Pool de figures réutilisables, indexées par figsize
+
+    Exemple :
+        with FigurePool() as pool:
+            for data in batches:
+                with pool.render(styled_bar, categories, data) as (fig, ax):
+                    fig.savefig(buffer, format='png')
+
+    Args:
+        max_per_size: Nombre maximal de figures libres conservées par figsize
+    """
+
+    def __init__(self, max_per_size=2):
+        self.max_per_size = max_per_size
+        self._free = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, figsize):
+        """Renvoie (fig, ax) : une figure vidée du pool ou une nouvelle figure"""
+        key = tuple(figsize)
+        fig = None
+        with self._lock:
+            free = self._free.get(key, [])
+            while free and fig is None:
+                fig = free.pop()
+                # Figure fermée entre-temps (ex. plt.close('all')) : on l'ignore
+                if fig.canvas.manager is None:
+                    fig = None
+        if fig is None:
+            fig = plt.figure(figsize=key)
+        else:
+            # La figure doit être courante pour plt.xticks / plt.tight_layout
+            plt.figure(fig.number)
+        ax = fig.add_subplot()
+        borrowed = getattr(_local, 'borrowed', None)
+        if borrowed is not None:
+            borrowed.append(fig)
+        return fig, ax
+
+    def release(self, fig):
+        """Vide la figure et la remet dans le pool (ou la ferme si le pool est plein)"""
+        fig.clear()
+        fig.subplotpars.update(**{name: mpl.rcParams[f'figure.subplot.{name}']
+                                  for name in _SUBPLOT_PARAMS})
+        if fig.canvas.manager is None:
+            return
+        key = tuple(float(size) for size in fig.get_size_inches())
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_per_size and fig not in free:
+                free.append(fig)
+                return
+        plt.close(fig)
+
+    @contextmanager
+    def render(self, func, *args, **kwargs):
+        """
+        Appelle une fonction styled_* avec des figures du pool
+
+        Toutes les figures empruntées pendant l'appel sont rendues au pool
+        à la sortie du bloc, y compris en cas d'exception.
+
+        Yields:
+            fig, ax: Figure et axes renvoyés par func
+        """
+        previous = getattr(_local, 'pool', None), getattr(_local, 'borrowed', None)
+        _local.pool, _local.borrowed = self, []
+        borrowed = _local.borrowed
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            for fig in borrowed:
+                self.release(fig)
+            raise
+        finally:
+            _local.pool, _local.borrowed = previous
+        try:
+            yield result
+        finally:
+            for fig in borrowed:
+                self.release(fig)
+
+    def export(self, func, fname, *args, savefig_kwargs=None, **kwargs):
+        """
+        Rend un graphique, l'enregistre dans fname puis libère la figure
+
+        Args:
+            func: Fonction styled_*
+            fname: Chemin ou objet fichier passé à fig.savefig
+            *args, **kwargs: Arguments transmis à func
+            savefig_kwargs: Options de fig.savefig (format, dpi...)
+        """
+        with self.render(func, *args, **kwargs) as (fig, ax):
+            fig.savefig(fname, **(savefig_kwargs or {}))
+
+    def close(self):
+        """Ferme toutes les figures conservées par le pool"""
+        with self._lock:
+            figures = [fig for free in self._free.values() for fig in free]
+            self._free.clear()
+        for fig in figures:
+            plt.close(fig)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(free) for free in self._free.values())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,278 @@
+"""
+Assemblage de rapports multi-pages à partir des fonctions styled_*
+Les graphiques sont rendus en parallèle dans des processus workers, puis
+écrits au fil de l'eau dans un PDF (PdfPages) ou un HTML autonome.
+"""
+
+import base64
+import html
+import io
+import os
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import multiprocessing
+
+import matplotlib
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from .pool import FigurePool
+from .styles import get_color
+
+# Pool de figures propre à chaque processus worker
+_WORKER_POOL = FigurePool()
+
+
+def _init_worker():
+    """
+    Initialise un processus worker de rendu : backend Agg (sans interface
+    graphique), quel que soit le backend du processus parent ou de la
+    plateforme. Le style est appliqué à l'import du package.
+    """
+    matplotlib.use('Agg')
+
+
+def _default_context():
+    """
+    Contexte multiprocessing des pools de rendu : jamais 'fork', car le pool
+    peut être créé depuis un processus multi-thread (serveur web, executor)
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def _render_chart(func, args, kwargs, fmt, dpi):
+    """
+    Rend un graphique dans un worker et renvoie (bytes, durée en secondes).
+
+    Le format 'pickle' renvoie la figure sérialisée (utilisée pour le PDF,
+    afin de conserver le rendu vectoriel). Les figures viennent du pool du
+    processus worker et y retournent après export : rien ne s'accumule dans
+    pyplot d'un rapport à l'autre.
+    """
+    start = time.perf_counter()
+    with _WORKER_POOL.render(func, *args, **kwargs) as (fig, ax):
+        if fmt == 'pickle':
+            data = pickle.dumps(fig)
+        else:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=fmt, dpi=dpi)
+            data = buffer.getvalue()
+    return data, time.perf_counter() - start
+
+
+def _ordered_results(executor, tasks, window):
+    """
+    Soumet les tâches par fenêtre glissante et renvoie les résultats dans l'ordre.
+
+    Au plus `window` résultats sont en vol à un instant donné, ce qui borne
+    la mémoire quel que soit le nombre de sections du rapport.
+    """
+    tasks = iter(tasks)
+    pending = deque(executor.submit(_render_chart, *task)
+                    for task in islice(tasks, window))
+    while pending:
+        result = pending.popleft().result()
+        for task in islice(tasks, 1):
+            pending.append(executor.submit(_render_chart, *task))
+        yield result
+
+
+class Report:
+    """
+    Constructeur de rapport : collecte graphiques, textes et cartes
+
+    Principes appliqués :
+    - Narration : le texte encadre les graphiques (contexte → visuel → message)
+    - Un graphique par page pour le PDF (un seul message par visuel)
+
+    Exemple :
+        report = Report(title="Bilan 2024")
+        report.add_text("Les ventes progressent au second semestre.")
+        report.add_chart(styled_line, x=months, y=sales, title="Ventes")
+        timings = report.save("bilan.pdf")
+
+    Args:
+        title: Titre du rapport
+        max_workers: Nombre de processus de rendu (défaut: nombre de CPU)
+        dpi: Résolution des images raster (défaut: rcParams['savefig.dpi'])
+    """
+
+    def __init__(self, title="", max_workers=None, dpi=None):
+        self.title = title
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.sections = []
+        self.timings = []
+
+    def add_text(self, text, title=""):
+        """Ajoute un bloc de texte narratif"""
+        self.sections.append({'kind': 'text', 'title': title, 'text': text})
+        return self
+
+    def add_chart(self, func, *args, caption="", **kwargs):
+        """
+        Ajoute un graphique construit par une fonction styled_*
+
+        Args:
+            func: Fonction de niveau module renvoyant (fig, ax), ex. styled_bar
+            *args, **kwargs: Arguments transmis à func (doivent être picklables)
+            caption: Légende affichée sous le graphique
+        """
+        self.sections.append({'kind': 'chart', 'title': kwargs.get('title', ''),
+                              'func': func, 'args': args, 'kwargs': kwargs,
+                              'caption': caption})
+        return self
+
+    def add_map(self, gdf, value_col, name_col, title="", caption=""):
+        """Ajoute une carte choroplèthe Bokeh (sortie HTML uniquement)"""
+        self.sections.append({'kind': 'map', 'title': title, 'gdf': gdf,
+                              'value_col': value_col, 'name_col': name_col,
+                              'caption': caption})
+        return self
+
+    def save(self, path, fmt=None, image_format='png'):
+        """
+        Rend toutes les sections et écrit le rapport
+
+        Args:
+            path: Chemin du fichier de sortie
+            fmt: 'pdf' ou 'html' (défaut: déduit de l'extension)
+            image_format: 'png' ou 'svg' pour les graphiques du HTML
+
+        Returns:
+            Liste de dicts {'section', 'kind', 'title', 'seconds'} :
+            temps de construction de chaque section
+        """
+        if fmt is None:
+            fmt = os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt not in ('pdf', 'html'):
+            raise ValueError(f"Format de rapport non supporté : {fmt!r}")
+        if image_format not in ('png', 'svg'):
+            raise ValueError(f"Format d'image non supporté : {image_format!r}")
+        if fmt == 'pdf' and any(s['kind'] == 'map' for s in self.sections):
+            raise ValueError("Les cartes Bokeh ne sont supportées qu'en sortie HTML")
+
+        self.timings = []
+        chart_fmt = 'pickle' if fmt == 'pdf' else image_format
+        tasks = ((s['func'], s['args'], s['kwargs'], chart_fmt, self.dpi)
+                 for s in self.sections if s['kind'] == 'chart')
+
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 mp_context=_default_context(),
+                                 initializer=_init_worker) as executor:
+            results = _ordered_results(executor, tasks, 2 * self.max_workers)
+            if fmt == 'pdf':
+                self._write_pdf(path, results)
+            else:
+                self._write_html(path, results, image_format)
+        return self.timings
+
+    def _record(self, index, section, seconds):
+        self.timings.append({'section': index, 'kind': section['kind'],
+                             'title': section['title'], 'seconds': seconds})
+
+    def _write_pdf(self, path, results):
+        with PdfPages(path) as pdf:
+            if self.title:
+                self._save_text_page(pdf, self.title, "", title_page=True)
+            for index, section in enumerate(self.sections):
+                if section['kind'] == 'text':
+                    start = time.perf_counter()
+                    self._save_text_page(pdf, section['title'], section['text'])
+                    self._record(index, section, time.perf_counter() - start)
+                    continue
+
+                data, seconds = next(results)
+                start = time.perf_counter()
+                fig = pickle.loads(data)
+                if section['caption']:
+                    self._add_caption(fig, section['caption'])
+                pdf.savefig(fig)
+                plt.close(fig)
+                self._record(index, section, seconds + time.perf_counter() - start)
+
+    @staticmethod
+    def _add_caption(fig, caption):
+        """Ajoute la légende en bas de page et refait la mise en page au-dessus"""
+        fontsize = plt.rcParams['font.size']
+        lines = caption.count('\n') + 1
+        # Hauteur réservée : lignes de texte (interligne 1.5) + marge, en fraction
+        reserved = (lines * fontsize * 1.5 + 6) / 72 / fig.get_size_inches()[1]
+        fig.text(0.5, 0.01, caption, ha='center', va='bottom',
+                 color=get_color('neutral'))
+        fig.tight_layout(rect=(0, 0.01 + reserved, 1, 1))
+
+    def _save_text_page(self, pdf, title, text, title_page=False):
+        fig = plt.figure(figsize=plt.rcParams['figure.figsize'])
+        try:
+            if title:
+                fig.text(0.5, 0.5 if title_page else 0.9, title, ha='center',
+                         va='center', fontsize=20 if title_page else 16,
+                         fontweight='bold', color=get_color('text'))
+            if text:
+                fig.text(0.1, 0.8, text, ha='left', va='top', wrap=True,
+                         fontsize=12, color=get_color('text'))
+            pdf.savefig(fig, bbox_inches=None)
+        finally:
+            plt.close(fig)
+
+    def _write_html(self, path, results, image_format):
+        resources = ""
+        if any(s['kind'] == 'map' for s in self.sections):
+            from bokeh.resources import INLINE
+            resources = INLINE.render()
+
+        with open(path, 'w', encoding='utf-8') as out:
+            out.write("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n")
+            out.write(f"<title>{html.escape(self.title)}</title>\n{resources}\n")
+            out.write("<style>body{font-family:sans-serif;max-width:1000px;"
+                      f"margin:auto;color:{get_color('text')}}}"
+                      "figure{margin:2em 0}img,svg{max-width:100%;height:auto}"
+                      f"figcaption{{color:{get_color('neutral')}}}</style>\n")
+            out.write("</head>\n<body>\n")
+            if self.title:
+                out.write(f"<h1>{html.escape(self.title)}</h1>\n")
+
+            for index, section in enumerate(self.sections):
+                if section['kind'] == 'chart':
+                    data, seconds = next(results)
+                    start = time.perf_counter()
+                    if image_format == 'svg':
+                        body = data.decode('utf-8')
+                        body = body[body.index('<svg'):]
+                    else:
+                        encoded = base64.b64encode(data).decode('ascii')
+                        body = (f"<img alt=\"{html.escape(section['title'])}\" "
+                                f"src=\"data:image/png;base64,{encoded}\">")
+                    out.write(self._html_figure(body, section['caption']))
+                    self._record(index, section,
+                                 seconds + time.perf_counter() - start)
+                    continue
+
+                start = time.perf_counter()
+                if section['kind'] == 'text':
+                    if section['title']:
+                        out.write(f"<h2>{html.escape(section['title'])}</h2>\n")
+                    for paragraph in section['text'].split('\n\n'):
+                        out.write(f"<p>{html.escape(paragraph)}</p>\n")
+                else:
+                    from bokeh.embed import components
+                    from .geo import styled_choropleth
+                    plot = styled_choropleth(section['gdf'], section['value_col'],
+                                             section['name_col'], section['title'])
+                    script, div = components(plot)
+                    out.write(self._html_figure(script + div, section['caption']))
+                self._record(index, section, time.perf_counter() - start)
+
+            out.write("</body>\n</html>\n")
+
+    @staticmethod
+    def _html_figure(body, caption):
+        if caption:
+            body += f"\n<figcaption>{html.escape(caption)}</figcaption>"
+        return f"<figure>\n{body}\n</figure>\n"
@@ -0,0 +1,342 @@
+"""
+Lignes de tendance pour les nuages de points
+Les données sont parcourues par blocs (compatible np.memmap) et résumées
+par des statistiques suffisantes ; la tendance est évaluée sur une petite
+grille triée, quel que soit le nombre de points.
+"""
+
+import numpy as np
+
+TREND_METHODS = ('ols', 'lowess', 'binned')
+
+# Taille de l'échantillon de la première passe (bornes robustes, classes)
+SAMPLE_SIZE = 100_000
+
+
+def _chunks(x, y, chunk_size):
+    """Itère sur des blocs (x, y) en float64, sans les valeurs non finies"""
+    for start in range(0, len(x), chunk_size):
+        xc = np.asarray(x[start:start + chunk_size], dtype=float)
+        yc = np.asarray(y[start:start + chunk_size], dtype=float)
+        finite = np.isfinite(xc) & np.isfinite(yc)
+        if not finite.all():
+            xc, yc = xc[finite], yc[finite]
+        if len(xc):
+            yield xc, yc
+
+
+def _quantile(ci, dof):
+    """Quantile bilatéral de Student (loi normale si scipy est absent)"""
+    try:
+        from scipy import stats
+        return stats.t.ppf(0.5 + ci / 2, max(dof, 1))
+    except ImportError:
+        from statistics import NormalDist
+        return NormalDist().inv_cdf(0.5 + ci / 2)
+
+
+def _ols_moments(x, y, chunk_size):
+    """
+    Une seule passe : effectif, moyennes, co-moments centrés et étendue de x
+
+    Les blocs sont combinés par la formule de Chan et al. (stable
+    numériquement, contrairement aux sommes brutes de x² et xy).
+    """
+    n = mx = my = cxx = cxy = cyy = 0.0
+    lo, hi = np.inf, -np.inf
+    for xc, yc in _chunks(x, y, chunk_size):
+        nb = len(xc)
+        mxb, myb = xc.mean(), yc.mean()
+        dx, dy = xc - mxb, yc - myb
+        total = n + nb
+        delta_x, delta_y = mxb - mx, myb - my
+        weight = n * nb / total
+        cxx += dx @ dx + delta_x * delta_x * weight
+        cxy += dx @ dy + delta_x * delta_y * weight
+        cyy += dy @ dy + delta_y * delta_y * weight
+        mx += delta_x * nb / total
+        my += delta_y * nb / total
+        n = total
+        lo, hi = min(lo, xc.min()), max(hi, xc.max())
+    return n, mx, my, cxx, cxy, cyy, lo, hi
+
+
+def _scan(x, y, chunk_size, sample_size=SAMPLE_SIZE):
+    """
+    Première passe des méthodes par classes : étendues et échantillon régulier
+
+    Un point sur `step` est conservé (tous si len(x) <= sample_size) ; les
+    bornes robustes et les classes sont définies sur cet échantillon.
+
+    Returns:
+        x_sample, y_sample, (x_min, x_max, y_min, y_max)
+    """
+    step = max(1, -(-len(x) // sample_size))
+    x_parts, y_parts = [], []
+    x_min = y_min = np.inf
+    x_max = y_max = -np.inf
+    for xc, yc in _chunks(x, y, chunk_size):
+        x_min, x_max = min(x_min, xc.min()), max(x_max, xc.max())
+        y_min, y_max = min(y_min, yc.min()), max(y_max, yc.max())
+        x_parts.append(xc[::step])
+        y_parts.append(yc[::step])
+    if not x_parts:
+        return np.empty(0), np.empty(0), (x_min, x_max, y_min, y_max)
+    return (np.concatenate(x_parts), np.concatenate(y_parts),
+            (x_min, x_max, y_min, y_max))
+
+
+def _robust_range(sample, lo, hi):
+    """
+    Bornes excluant les valeurs aberrantes : barrières de Tukey à 3 IQR
+    (quantiles 0,1 % - 99,9 % si l'IQR est nul), limitées à [lo, hi]
+    """
+    q1, q3 = np.quantile(sample, [0.25, 0.75])
+    iqr = q3 - q1
+    if iqr > 0:
+        fence_lo, fence_hi = q1 - 3 * iqr, q3 + 3 * iqr
+    else:
+        fence_lo, fence_hi = np.quantile(sample, [0.001, 0.999])
+    return max(fence_lo, lo), min(fence_hi, hi)
+
+
+def _fit_ols(x, y, grid_size, ci, chunk_size):
+    n, mx, my, cxx, cxy, cyy, lo, hi = _ols_moments(x, y, chunk_size)
+    if n < 2 or cxx == 0:
+        raise ValueError("La tendance OLS nécessite au moins deux valeurs de x distinctes")
+    slope = cxy / cxx
+    intercept = my - slope * mx
+    grid = np.linspace(lo, hi, grid_size)
+    trend = {'x': grid, 'y': intercept + slope * grid, 'n': int(n),
+             'coef': (slope, intercept)}
+    if ci is not None:
+        dof = n - 2
+        sigma2 = max(cyy - slope * cxy, 0.0) / max(dof, 1)
+        half = _quantile(ci, dof) * np.sqrt(sigma2 * (1 / n + (grid - mx) ** 2 / cxx))
+        trend['lower'], trend['upper'] = trend['y'] - half, trend['y'] + half
+    return trend
+
+
+def _fit_lowess(x, y, grid_size, ci, chunk_size, bins, frac):
+    """
+    LOWESS (régression linéaire locale, noyau tricube) sur données agrégées
+
+    Les points sont résumés par classe de x (effectif, sommes de x, y, x²,
+    xy, y²) ; les poids tricube sont appliqués par classe. Pas d'itérations
+    de robustesse.
+
+    Les classes ont des effectifs égaux (quantiles de l'échantillon de x) et
+    la grille suit aussi les quantiles, du minimum au maximum : tous les
+    points sont utilisés, une valeur aberrante ne fait qu'élargir la
+    dernière classe.
+    """
+    x_sample, y_sample, (x_min, x_max, y_min, y_max) = _scan(x, y, chunk_size)
+    if len(x_sample) < 2:
+        raise ValueError("La tendance LOWESS nécessite au moins deux points")
+    edges = np.unique(np.quantile(x_sample, np.linspace(0, 1, bins + 1)[1:-1]))
+    n_x = len(edges) + 1
+
+    # Normalisation affine sur l'étendue robuste (précision numérique
+    # uniquement : aucune valeur n'est écartée)
+    x_lo, x_hi = _robust_range(x_sample, x_min, x_max)
+    y_lo, y_hi = _robust_range(y_sample, y_min, y_max)
+    x_span = (x_hi - x_lo) or 1.0
+    y_span = (y_hi - y_lo) or 1.0
+
+    # Sommes par classe en coordonnées normalisées
+    sums = np.zeros((6, n_x))
+    for xc, yc in _chunks(x, y, chunk_size):
+        u, v = (xc - x_lo) / x_span, (yc - y_lo) / y_span
+        index = np.searchsorted(edges, xc, side='right')
+        for row, weights in enumerate((None, u, v, u * u, u * v, v * v)):
+            sums[row] += np.bincount(index, weights=weights, minlength=n_x)
+    count = sums[0]
+    n = count.sum()
+
+    occupied = count > 0
+    sums = sums[:, occupied]
+    count = sums[0]
+    centers = sums[1] / count
+    grid_x = np.unique(np.quantile(x_sample, np.linspace(0, 1, grid_size)))
+    grid_x[0], grid_x[-1] = x_min, x_max
+    grid = (grid_x - x_lo) / x_span
+    grid_size = len(grid)
+
+    # Largeur de fenêtre : plus petite distance couvrant frac * n points
+    distances = np.abs(grid[:, None] - centers[None, :])
+    order = np.argsort(distances, axis=1)
+    covered = np.cumsum(count[order], axis=1)
+    reach = np.minimum((covered < frac * n).sum(axis=1), len(centers) - 1)
+    bandwidth = np.take_along_axis(distances, order, axis=1)[np.arange(grid_size), reach]
+    bandwidth = np.maximum(bandwidth, 1.0 / bins) * 1.0001
+    weights = np.clip(1 - (distances / bandwidth[:, None]) ** 3, 0, None) ** 3
+
+    s0, su, sv, suu, suv, svv = sums @ weights.T
+    u_bar, v_bar = su / s0, sv / s0
+    var_u = np.maximum(suu - s0 * u_bar ** 2, 0.0)
+    cov_uv = suv - s0 * u_bar * v_bar
+    slope = np.divide(cov_uv, var_u, out=np.zeros_like(var_u), where=var_u > 1e-12)
+    fitted = v_bar + slope * (grid - u_bar)
+
+    trend = {'x': grid_x, 'y': y_lo + fitted * y_span, 'n': int(n)}
+    if ci is not None:
+        # Intervalle approché : effectif pondéré effectif (Kish)
+        n_eff = s0 ** 2 / ((weights ** 2) @ count)
+        rss = np.maximum(svv - s0 * v_bar ** 2 - slope * cov_uv, 0.0)
+        sigma2 = rss / s0 * n_eff / np.maximum(n_eff - 2, 1)
+        leverage = 1 / n_eff + np.divide((grid - u_bar) ** 2 * s0 / n_eff, var_u,
+                                         out=np.zeros_like(var_u), where=var_u > 1e-12)
+        half = _quantile(ci, n_eff.min() - 2) * np.sqrt(sigma2 * leverage) * y_span
+        trend['lower'], trend['upper'] = trend['y'] - half, trend['y'] + half
+    return trend
+
+
+def _bucket_index(values, lo, width, y_bins):
+    """Classe de y : 0 sous lo, 1..y_bins dans l'étendue, y_bins + 1 au-delà"""
+    index = np.floor((values - lo) / width) + 1
+    return np.clip(index, 0, y_bins + 1).astype(np.int64)
+
+
+def _fit_binned(x, y, ci, chunk_size, bins, y_bins=1024):
+    """
+    Médiane exacte de y par classe de x
+
+    Les classes de x ont des effectifs égaux (quantiles de l'échantillon).
+    Une deuxième passe compte les y de chaque classe dans y_bins intervalles
+    (étendue robuste propre à la classe) ; une troisième ne conserve que les
+    valeurs des intervalles contenant les rangs recherchés, ce qui donne les
+    quantiles exacts (interpolation linéaire, comme np.quantile) sans trier
+    les données.
+    """
+    x_sample, y_sample, (x_min, x_max, y_min, y_max) = _scan(x, y, chunk_size)
+    if not len(x_sample):
+        raise ValueError("La tendance par classes nécessite au moins un point")
+
+    # Classes d'effectifs égaux : une valeur aberrante de x ne fait que
+    # rejoindre la dernière classe
+    edges = np.unique(np.quantile(x_sample, np.linspace(0, 1, bins + 1)[1:-1]))
+    n_x = len(edges) + 1
+    sample_bin = np.searchsorted(edges, x_sample, side='right')
+
+    # Étendue robuste de y par classe, estimée sur l'échantillon
+    global_lo, global_hi = _robust_range(y_sample, y_min, y_max)
+    y_lo = np.full(n_x, global_lo)
+    y_hi = np.full(n_x, global_hi)
+    for b in np.unique(sample_bin):
+        in_bin = y_sample[sample_bin == b]
+        y_lo[b], y_hi[b] = _robust_range(in_bin, y_min, y_max)
+    width = (y_hi - y_lo) / y_bins
+    width[width <= 0] = 1.0
+    n_buckets = y_bins + 2
+
+    counts = np.zeros(n_x * n_buckets, dtype=np.int64)
+    x_sums = np.zeros(n_x)
+    for xc, yc in _chunks(x, y, chunk_size):
+        index = np.searchsorted(edges, xc, side='right')
+        bucket = _bucket_index(yc, y_lo[index], width[index], y_bins)
+        counts += np.bincount(index * n_buckets + bucket, minlength=n_x * n_buckets)
+        x_sums += np.bincount(index, weights=xc, minlength=n_x)
+    counts = counts.reshape(n_x, n_buckets)
+    n_bin = counts.sum(axis=1)
+
+    occupied = np.flatnonzero(n_bin > 0)
+    counts, n_bin = counts[occupied], n_bin[occupied]
+    cumulative = np.cumsum(counts, axis=1)
+
+    # Rangs (0-indexés) encadrant chaque quantile recherché
+    levels = np.array([0.5] if ci is None else [0.5, 0.25, 0.75])
+    positions = levels[None, :] * (n_bin[:, None] - 1)
+    ranks = np.concatenate([np.floor(positions), np.ceil(positions)], axis=1)
+    ranks = ranks.astype(np.int64)
+    rows = np.arange(len(occupied))[:, None]
+    rank_bucket = (cumulative[:, :, None] <= ranks[:, None, :]).sum(axis=1)
+
+    needed = np.zeros((n_x, n_buckets), dtype=bool)
+    needed[occupied[:, None], rank_bucket] = True
+    kept_bins, kept_values = [], []
+    for xc, yc in _chunks(x, y, chunk_size):
+        index = np.searchsorted(edges, xc, side='right')
+        bucket = _bucket_index(yc, y_lo[index], width[index], y_bins)
+        keep = needed[index, bucket]
+        kept_bins.append(index[keep])
+        kept_values.append(yc[keep])
+    kept_bins = np.concatenate(kept_bins)
+    kept_values = np.concatenate(kept_values)
+    kept_values = kept_values[np.lexsort((kept_values, kept_bins))]
+
+    # Position de chaque rang dans les valeurs conservées (triées par classe, puis y)
+    kept = counts * needed[occupied]
+    kept_before = np.cumsum(kept, axis=1) - kept
+    bin_start = np.cumsum(kept.sum(axis=1)) - kept.sum(axis=1)
+    before = cumulative - counts
+    position = (bin_start[:, None] + kept_before[rows, rank_bucket]
+                + ranks - before[rows, rank_bucket])
+    values = kept_values[position]
+    n_levels = len(levels)
+    frac = positions - np.floor(positions)
+    quantiles = values[:, :n_levels] + frac * (values[:, n_levels:] - values[:, :n_levels])
+
+    # Position des classes : médiane de x dans l'échantillon (robuste)
+    sample_sorted = np.sort(x_sample)
+    sample_count = np.bincount(sample_bin, minlength=n_x)
+    sample_start = np.cumsum(sample_count) - sample_count
+    sample_median = sample_sorted[np.minimum(sample_start + sample_count // 2,
+                                             len(sample_sorted) - 1)]
+    centers = np.where(sample_count[occupied] > 0, sample_median[occupied],
+                       x_sums[occupied] / n_bin)
+
+    median = quantiles[:, 0]
+    trend = {'x': centers, 'y': median, 'n': int(n_bin.sum())}
+    if ci is not None:
+        # Intervalle de la médiane (McGill et al., encoches des boxplots)
+        iqr = quantiles[:, 2] - quantiles[:, 1]
+        z = _quantile(ci, np.inf)
+        half = z / 1.96 * 1.57 * iqr / np.sqrt(n_bin)
+        trend['lower'], trend['upper'] = median - half, median + half
+    return trend
+
+
+def fit_trend(x, y, method='ols', ci=None, grid_size=100, bins=200, frac=0.3,
+              chunk_size=1_000_000):
+    """
+    Calcule une tendance de y en fonction de x, évaluée sur une grille triée
+
+    Méthodes :
+    - 'ols' : régression linéaire, une seule passe sur les données
+    - 'lowess' : régression linéaire locale (tricube) sur données agrégées
+      par classe de x (effectifs égaux), deux passes
+    - 'binned' : médiane exacte de y par classe de x (classes d'effectifs
+      égaux), trois passes
+
+    Args:
+        x: Array de valeurs x (liste, array ou np.memmap)
+        y: Array de valeurs y, même longueur
+        method: 'ols', 'lowess' ou 'binned'
+        ci: Niveau de l'intervalle de confiance (ex. 0.95), None pour aucun
+        grid_size: Nombre de points de la grille ('ols' ; 'lowess' : grille
+            aux quantiles de x, du minimum au maximum)
+        bins: Nombre de classes de x ('lowess' et 'binned' ; moins pour
+            'binned' si x a beaucoup de valeurs égales)
+        frac: Part des points dans chaque fenêtre locale ('lowess')
+        chunk_size: Taille des blocs lus en mémoire
+
+    Returns:
+        dict avec 'x', 'y' (tendance sur la grille), 'n' (points utilisés),
+        'lower'/'upper' si ci est fourni et 'coef' (pente, ordonnée) pour 'ols'
+    """
+    if method not in TREND_METHODS:
+        raise ValueError(f"Méthode de tendance inconnue : {method!r} "
+                         f"(attendu : {', '.join(TREND_METHODS)})")
+    if ci is not None and not 0 < ci < 1:
+        raise ValueError("ci doit être compris entre 0 et 1")
+    # np.memmap est un ndarray : il est lu par blocs, sans copie complète
+    x = x if isinstance(x, np.ndarray) else np.asarray(x)
+    y = y if isinstance(y, np.ndarray) else np.asarray(y)
+    if len(x) != len(y):
+        raise ValueError("x et y doivent avoir la même longueur")
+
+    if method == 'ols':
+        return _fit_ols(x, y, grid_size, ci, chunk_size)
+    if method == 'lowess':
+        return _fit_lowess(x, y, grid_size, ci, chunk_size, bins, frac)
+    return _fit_binned(x, y, ci, chunk_size, bins)
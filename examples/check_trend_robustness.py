@@ -0,0 +1,82 @@
+"""
+Vérification de non-régression de fit_trend face aux valeurs aberrantes.
+
+- 'binned' : une valeur y = 1e6 ne doit pas déplacer les médianes, qui
+  doivent être égales à np.median calculé classe par classe.
+- 'lowess' : une valeur x = 1e6 ne doit pas dégrader la tendance par rapport
+  à un LOWESS exact calculé sur les données sans la valeur aberrante.
+- 'lowess' sur x à queue lourde (log-normale) : aucun point n'est écarté et
+  la tendance couvre toute l'étendue de x.
+
+Usage : python examples/check_trend_robustness.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from datastory_viz import fit_trend
+
+
+def exact_lowess(x, y, at, frac=0.3):
+    """LOWESS de référence (tricube, linéaire local) en un point"""
+    distance = np.abs(x - at)
+    bandwidth = np.sort(distance)[int(frac * len(x)) - 1] * 1.0001
+    weights = np.sqrt(np.clip(1 - (distance / bandwidth) ** 3, 0, None) ** 3)
+    design = np.column_stack([np.ones_like(x), x - at]) * weights[:, None]
+    return np.linalg.lstsq(design, y * weights, rcond=None)[0][0]
+
+
+def check_binned_y_outlier(rng, n=100_000, bins=200):
+    x = rng.uniform(0, 10, n)
+    y = rng.normal(0, 1, n)
+    y[0] = 1e6
+    trend = fit_trend(x, y, method='binned', bins=bins)
+
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, bins + 1)[1:-1]))
+    index = np.searchsorted(edges, x, side='right')
+    expected = np.array([np.median(y[index == b]) for b in range(len(edges) + 1)])
+    assert np.allclose(trend['y'], expected), "Médianes par classe inexactes"
+    assert np.abs(trend['y']).max() < 0.5, "Médianes déplacées par la valeur aberrante"
+    print(f"binned : {len(trend['y'])} médianes exactes malgré y = 1e6")
+
+
+def check_lowess_x_outlier(rng, n=100_000):
+    x = rng.uniform(0, 10, n)
+    y = np.sin(x) + rng.normal(0, 0.3, n)
+    x_outlier = x.copy()
+    x_outlier[0] = 1e6
+    trend = fit_trend(x_outlier, y, method='lowess')
+
+    assert trend['n'] == n, "Des points ont été écartés"
+    in_data = trend['x'] <= x[1:].max()
+    probes, fitted = trend['x'][in_data][::10], trend['y'][in_data][::10]
+    expected = np.array([exact_lowess(x[1:], y[1:], at) for at in probes])
+    error = np.abs(expected - fitted).max()
+    assert error < 0.02, f"Écart au LOWESS exact trop grand : {error:.3f}"
+    print(f"lowess : écart max au LOWESS exact {error:.4f} malgré x = 1e6")
+
+
+def check_lowess_heavy_tail(rng, n=200_000):
+    x = rng.lognormal(0, 1.5, n)
+    y = np.log1p(x) + rng.normal(0, 0.2, n)
+    trend = fit_trend(x, y, method='lowess')
+
+    assert trend['n'] == len(x), "Des points de la queue ont été écartés"
+    assert trend['x'].min() == x.min() and trend['x'].max() == x.max(), \
+        "La tendance ne couvre pas toute l'étendue de x"
+    expected = np.array([exact_lowess(x, y, at) for at in trend['x'][::10]])
+    error = np.abs(expected - trend['y'][::10]).max()
+    assert error < 0.02, f"Écart au LOWESS exact trop grand : {error:.3f}"
+    print(f"lowess : {trend['n']} points log-normaux, tendance jusqu'à "
+          f"x = {trend['x'].max():.0f}, écart max {error:.4f}")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    check_binned_y_outlier(rng)
+    check_lowess_x_outlier(rng)
+    check_lowess_heavy_tail(rng)
+    print("✅ fit_trend robuste aux valeurs aberrantes")
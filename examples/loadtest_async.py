@@ -0,0 +1,74 @@
+"""
+Banc de charge du rendu asynchrone : débit et latence selon la concurrence.
+
+Simule des requêtes web concurrentes appelant AsyncRenderer.render et mesure
+aussi le retard de la boucle d'événements (doit rester proche de zéro).
+
+Usage : python examples/loadtest_async.py [requêtes_par_niveau] [workers]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import datastory_viz as dsv
+
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32, 64]
+
+
+async def measure_loop_lag(stop, interval=0.01):
+    """Retard maximal observé de la boucle d'événements (s)"""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run_level(renderer, concurrency, n_requests):
+    rng = np.random.default_rng(concurrency)
+    categories = ['A', 'B', 'C', 'D', 'E']
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request():
+        async with gate:
+            start = time.perf_counter()
+            await renderer.render(dsv.styled_bar, categories,
+                                  rng.integers(0, 100, 5).tolist(),
+                                  format='png', dpi=72)
+            latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.ensure_future(measure_loop_lag(stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(n_requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await lag_task
+
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{concurrency:>11} | {n_requests / elapsed:>8.1f} | "
+          f"{p50 * 1000:>8.1f} | {p99 * 1000:>8.1f} | {lag * 1000:>8.1f}")
+
+
+async def main(n_requests=200, max_workers=None):
+    async with dsv.AsyncRenderer(max_workers=max_workers) as renderer:
+        # Attente du pré-chauffage des workers
+        await renderer.render(dsv.styled_bar, ['A'], [1], dpi=10)
+        print(f"workers={renderer.max_workers}, "
+              f"max_pending={renderer.max_pending}, requêtes={n_requests}")
+        print("concurrence | req/s    | p50 (ms) | p99 (ms) | lag (ms)")
+        for concurrency in CONCURRENCY_LEVELS:
+            await run_level(renderer, concurrency, n_requests)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    asyncio.run(main(n, workers))
@@ -0,0 +1,62 @@
+"""
+Test d'endurance du FigurePool : rend un grand nombre de graphiques et
+vérifie que la mémoire résidente (RSS) reste stable.
+
+Usage : python examples/soak_figure_pool.py [nombre_de_graphiques]
+"""
+
+import io
+import os
+import sys
+import warnings
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import datastory_viz as dsv
+
+
+def rss_mb():
+    """Mémoire résidente actuelle du processus (Linux : /proc/self/statm)"""
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / 1e6
+
+
+def run_soak(n_charts=100_000, warmup=500, tolerance_mb=20.0):
+    warnings.simplefilter('error', RuntimeWarning)  # "More than 20 figures"
+    rng = np.random.default_rng(42)
+    categories = ['A', 'B', 'C', 'D', 'E']
+    charts = [
+        (dsv.styled_bar, lambda: (categories, rng.integers(0, 100, 5))),
+        (dsv.styled_line, lambda: (np.arange(12), rng.normal(size=12).cumsum())),
+        (dsv.styled_scatter, lambda: (rng.normal(size=50), rng.normal(size=50))),
+    ]
+
+    buffer = io.BytesIO()
+    baseline = None
+    with dsv.FigurePool() as pool:
+        for i in range(n_charts):
+            func, make_args = charts[i % len(charts)]
+            buffer.seek(0)
+            buffer.truncate()
+            pool.export(func, buffer, *make_args(),
+                        savefig_kwargs={'format': 'png', 'dpi': 50})
+            if i + 1 == min(warmup, n_charts):
+                baseline = rss_mb()
+            if (i + 1) % 10_000 == 0:
+                print(f"{i + 1} graphiques - RSS {rss_mb():.1f} Mo "
+                      f"- figures ouvertes {len(plt.get_fignums())}")
+
+    final = rss_mb()
+    print(f"RSS après échauffement : {baseline:.1f} Mo, final : {final:.1f} Mo")
+    assert len(plt.get_fignums()) == 0, "Des figures sont restées ouvertes"
+    assert final - baseline < tolerance_mb, "La mémoire n'est pas stable"
+    print("✅ Mémoire stable")
+
+
+if __name__ == "__main__":
+    run_soak(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)